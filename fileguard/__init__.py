@@ -1 +1,2 @@
-from . fileguard import guard
+from . fileguard import guard, set_backup_roots
+from . fingerprints import fingerprint, StatCache
@@ -5,15 +5,63 @@ import ntpath
 import tempfile
 import distutils.dir_util
 from functools import wraps
-from .utils import path_is_dir
+from .utils import path_is_dir, path_size, free_space, mirror_path
 from types import FunctionType
 
+BACKUP_ROOTS_ENV_VAR = 'FILEGUARD_BACKUP_ROOTS'
+
+# Module-level backup root policy, see set_backup_roots()
+_backup_roots = None
+
+def set_backup_roots(*roots):
+    """Set the directories in which backups are preferably stored.
+
+    The roots are tried in order and the first one with enough free space
+    to hold the backup is used. If none of them fits, the backup falls back
+    to the system's default temporary directory. Calling this function
+    without arguments resets the policy, so that the
+    ``FILEGUARD_BACKUP_ROOTS`` environment variable is used again.
+
+    Args:
+        roots ([path-like [path-like ...]]): The candidate backup roots,
+        for example a tmpfs mount such as ``/dev/shm``.
+    """
+    global _backup_roots
+    _backup_roots = list(roots) if roots else None
+
+def _get_backup_roots(roots=None):
+    """
+    Resolve the candidate backup roots. The per-guard roots take precedence
+    over the module-level ones, which take precedence over the ones in the
+    environment variable (separated by os.pathsep).
+    """
+    if roots is None:
+        roots = _backup_roots
+    if roots is None:
+        env_roots = os.environ.get(BACKUP_ROOTS_ENV_VAR, '')
+        roots = [root for root in env_roots.split(os.pathsep) if root]
+    return list(roots)
+
+def _select_backup_root(roots, size):
+    """
+    Return the first usable root with at least `size` bytes of free space
+    or None, meaning that the system's default temp directory should be used.
+    """
+    for root in roots:
+        if not os.path.isdir(root) or not os.access(root, os.W_OK | os.X_OK):
+            continue
+        if free_space(root) >= size:
+            return root
+    return None
+
 class _guard(object):
 
-    def __init__(self, paths):
+    def __init__(self, paths, backup_roots=None, mirror=False):
         self._backup = {}
         for path in paths:
             self._backup[path] = []
+        self._backup_roots = backup_roots
+        self._mirror = mirror
         self._tmp_dir = None
 
     def __call__(self, func):
@@ -33,7 +81,16 @@ class _guard(object):
 
     def _set_up_tmp_dir_if_needed(self):
         if self._tmp_dir is None:
-            self._tmp_dir = tempfile.TemporaryDirectory(prefix='fileguard_')
+            roots = _get_backup_roots(self._backup_roots)
+            root = None
+            if roots:
+                # only walk the guarded paths if there is a choice to be made
+                # mirror backups keep the symlinks within the tree as they are
+                size = sum(path_size(path, follow_symlinks=not self._mirror)
+                           for path in self._backup)
+                root = _select_backup_root(roots, size)
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix='fileguard_',
+                                                        dir=root)
 
     def _cleanup_tmp_dir_if_needed(self):
         """
@@ -54,27 +111,48 @@ class _guard(object):
 
         for path in self._backup:
             is_dir = path_is_dir(path)
+            target_path = path
+            if self._mirror:
+                # the mirror restore replaces symlinks, so a guarded symlink
+                # is resolved to the file or directory that it points to
+                target_path = os.path.realpath(path)
 
             tmp_file_name = uuid.uuid4().hex
             temp_path = os.path.join(self._tmp_dir.name, tmp_file_name)
-            if is_dir:
+            if is_dir and self._mirror:
+                # copy directory, keeping symlinks as they are
+                shutil.copytree(target_path, temp_path, symlinks=True)
+            elif is_dir:
                 # copy directory
                 distutils.dir_util.copy_tree(path, temp_path)
             else:
                 # copy file
                 shutil.copy2(path, temp_path)
 
-            self._backup[path].append((temp_path, is_dir))
+            self._backup[path].append((temp_path, is_dir, target_path))
+
+    def reset(self):
+        """Restore the most recent backup, without discarding it.
 
-    def _restore_backup_content(self):
+        This allows restoring the same backup multiple times, for example
+        after each one of the tests which share the guarded paths.
+        """
+        self._restore_backup_content(discard=False)
+
+    def _restore_backup_content(self, discard=True):
         for path in self._backup:
-            tmp_file_path, is_dir = self._backup[path].pop()
-            if is_dir:
+            if discard:
+                tmp_file_path, is_dir, target_path = self._backup[path].pop()
+            else:
+                tmp_file_path, is_dir, target_path = self._backup[path][-1]
+            if self._mirror:
+                mirror_path(tmp_file_path, target_path)
+            elif is_dir:
                 distutils.dir_util.copy_tree(tmp_file_path, path)
             else:
                 shutil.copy2(tmp_file_path, path)
 
-            if len(self._backup[path]) == 0:
+            if discard and len(self._backup[path]) == 0:
                 # a little optimization: only try to clean the directory up
                 # if there is a gurantee that at lest one file backup list
                 # is empty.
@@ -110,7 +188,7 @@ class _guard(object):
             setattr(klass, attr, wrapped)
         return klass
 
-def guard(*paths):
+def guard(*paths, backup_roots=None, mirror=False):
     """Preserve the contents of a file.
 
     Can be used as a function decorator, a context manager or a class decorator.
@@ -123,5 +201,15 @@ def guard(*paths):
         paths ([path-like [path-like ...]]): The path (or list of paths) of
         the file to be guarded. It must be path-like, such as a string.
         In general, any object accepted by `pathlib.Path` can be used.
+        backup_roots (list of path-like, optional): The directories in which
+        the backup is preferably stored, tried in order. The first one with
+        enough free space is used, otherwise the system's default temp
+        directory is. Overrides the roots set with `set_backup_roots()` and
+        the `FILEGUARD_BACKUP_ROOTS` environment variable.
+        mirror (bool, optional): If True, the guarded paths are restored to
+        exactly mirror their backup: files and directories created within
+        the scope are removed, types and permissions are reset and symbolic
+        links are restored. By default, the backup is merged into the
+        guarded directories.
     """
-    return _guard(paths)
+    return _guard(paths, backup_roots, mirror)
@@ -0,0 +1,182 @@
+import os
+import stat
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Files at least this big are hashed in a thread pool, smaller ones are hashed
+# right away, since handing them over to a thread would cost more than hashing.
+LARGE_FILE_SIZE = 1024 * 1024
+_CHUNK_SIZE = 1024 * 1024
+
+# How many roots fingerprint() caches the file digests of, when no cache is
+# passed to it. The least recently fingerprinted root is dropped first.
+MAX_CACHED_ROOTS = 64
+
+
+class StatCache(object):
+    """Cache of file digests keyed by the stat results of the files.
+
+    The key is (device, inode, modification time in ns, size), so a file
+    that has not been touched since it was last hashed is never read again.
+    If the inode is not known (it is 0), the path of the file is used instead.
+    The cache can be shared between threads and `fingerprint()` calls.
+    """
+
+    def __init__(self):
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path, stat_result):
+        if stat_result.st_ino:
+            file_id = (stat_result.st_dev, stat_result.st_ino)
+        else:
+            file_id = (os.path.abspath(path),)
+        return file_id + (stat_result.st_mtime_ns, stat_result.st_size)
+
+    def get(self, path, stat_result):
+        return self._digests.get(self.key(path, stat_result))
+
+    def put(self, path, stat_result, digest):
+        with self._lock:
+            self._digests[self.key(path, stat_result)] = digest
+
+    def retain(self, keys):
+        """Drop the digests of all of the files whose keys are not in `keys`."""
+        with self._lock:
+            self._digests = {key: digest for key, digest
+                             in self._digests.items() if key in keys}
+
+    def clear(self):
+        with self._lock:
+            self._digests.clear()
+
+    def __len__(self):
+        return len(self._digests)
+
+
+_root_caches = OrderedDict()
+_root_caches_lock = threading.Lock()
+
+
+def _get_root_cache(root):
+    """Return the default cache of a root, evicting the least recently used
+    root if there are too many of them."""
+    with _root_caches_lock:
+        cache = _root_caches.pop(root, None)
+        if cache is None:
+            cache = StatCache()
+        _root_caches[root] = cache
+        while len(_root_caches) > MAX_CACHED_ROOTS:
+            _root_caches.popitem(last=False)
+        return cache
+
+
+def _hash_file(path):
+    """Return the SHA-256 digest of the contents of a file.
+
+    hashlib releases the GIL while hashing big chunks, so multiple files can
+    be hashed in parallel by threads.
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray(_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as file:
+        while True:
+            size = file.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+    return digest.digest()
+
+
+def _scan(path):
+    """
+    Walk the tree rooted at `path` once, yielding (relative path, stat result,
+    absolute path) for each entry, the root included. Symbolic links within
+    the tree are not followed, but the root itself is, like `guard()` does.
+    """
+    root_stat = os.stat(path)
+    yield '', root_stat, path
+    if not stat.S_ISDIR(root_stat.st_mode):
+        return
+
+    stack = [('', path)]
+    while stack:
+        rel_dir, abs_dir = stack.pop()
+        with os.scandir(abs_dir) as it:
+            for entry in it:
+                rel_path = os.path.join(rel_dir, entry.name)
+                stat_result = entry.stat(follow_symlinks=False)
+                if not stat_result.st_ino:
+                    # DirEntry.stat() does not fill in the inode on Windows
+                    stat_result = os.lstat(entry.path)
+                yield rel_path, stat_result, entry.path
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((rel_path, entry.path))
+
+
+def fingerprint(path, cache=None, max_workers=None):
+    """Return a fingerprint of the contents of a file or of a directory tree.
+
+    The fingerprint is a hex digest which changes whenever a file or
+    directory is created, removed or renamed, the contents or permissions
+    of a file change, or a symbolic link points somewhere else. Modification
+    times are not taken into account. It can be used to quickly check whether
+    a tree has changed.
+
+    Args:
+        path (path-like): The file or directory to fingerprint.
+        cache (StatCache, optional): The cache of file digests. By default,
+        each root has its own cache, which only keeps the files found by
+        the latest call, and up to `MAX_CACHED_ROOTS` roots are cached.
+        Pass a cache to share it between roots or to manage it yourself.
+        max_workers (int, optional): The number of threads hashing large
+        files. Defaults to the `ThreadPoolExecutor` default.
+    """
+    # the keys of the files found, if the default cache is used, so that
+    # the files which no longer exist can be dropped from it
+    seen_keys = None
+    if cache is None:
+        cache = _get_root_cache(os.path.realpath(path))
+        seen_keys = set()
+
+    entries = []
+    large_files = []
+    for rel_path, stat_result, abs_path in _scan(os.fspath(path)):
+        mode = stat_result.st_mode
+        if stat.S_ISREG(mode):
+            if seen_keys is not None:
+                seen_keys.add(cache.key(abs_path, stat_result))
+            digest = cache.get(abs_path, stat_result)
+            if digest is None:
+                if stat_result.st_size >= LARGE_FILE_SIZE:
+                    large_files.append((len(entries), stat_result, abs_path))
+                else:
+                    digest = _hash_file(abs_path)
+                    cache.put(abs_path, stat_result, digest)
+        elif stat.S_ISLNK(mode):
+            digest = os.fsencode(os.readlink(abs_path))
+        else:
+            digest = b''
+        entries.append([rel_path, mode, digest])
+
+    if large_files:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            digests = executor.map(_hash_file,
+                                   [abs_path for _, _, abs_path in large_files])
+            for (index, stat_result, abs_path), digest in zip(large_files,
+                                                              digests):
+                cache.put(abs_path, stat_result, digest)
+                entries[index][2] = digest
+
+    if seen_keys is not None:
+        cache.retain(seen_keys)
+
+    tree_digest = hashlib.sha256()
+    for rel_path, mode, digest in sorted(entries):
+        tree_digest.update(os.fsencode(rel_path) + b'\0')
+        tree_digest.update(f'{mode:o} {len(digest)}\0'.encode() + digest)
+    return tree_digest.hexdigest()
@@ -0,0 +1,140 @@
+"""pytest plugin which shares fileguard backups between tests.
+
+Instead of backing up the same paths before every test, the declared paths are
+backed up once per session (or module) and are reset after each test, using
+the exact mirror restore, which only copies what has changed.
+
+Paths are declared either with the ``fileguard_paths`` ini option, which
+applies to every test and is relative to the ini file, or with the
+``fileguard`` marker, which is relative to the rootdir:
+
+    @pytest.mark.fileguard('config.ini', 'data_dir', scope='module')
+    def test_something():
+        ...
+
+Tests can also request the ``fileguard`` fixture explicitly.
+"""
+import os
+import time
+import pytest
+from .fileguard import _guard
+
+SCOPES = ('session', 'module')
+
+_timings_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    parser.addini('fileguard_paths', type='paths', default=[],
+                  help='Paths to fileguard for every test, relative to the '
+                       'ini file.')
+    parser.addini('fileguard_scope', default='session',
+                  help='How often the fileguarded paths are backed up: '
+                       'once per "session" (default) or per "module".')
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'fileguard(*paths, scope=None): back up the paths once per session '
+        'or module and restore them after the test.')
+    config.stash[_timings_key] = {}
+
+
+def _get_declared_paths(request):
+    """
+    Return a list of (scope, path) pairs of all of the paths declared for
+    the requesting test. Marker paths are relative to the rootdir.
+    """
+    config = request.config
+    default_scope = config.getini('fileguard_scope')
+
+    declared = [(default_scope, path) for path in config.getini('fileguard_paths')]
+    for marker in request.node.iter_markers('fileguard'):
+        scope = marker.kwargs.get('scope', default_scope)
+        declared.extend((scope, os.path.join(config.rootpath, path))
+                        for path in marker.args)
+
+    for scope, path in declared:
+        if scope not in SCOPES:
+            raise pytest.UsageError(
+                f'Invalid fileguard scope {scope!r} for {path!r}, '
+                f'expected one of: {", ".join(SCOPES)}')
+    return declared
+
+
+def _exit_snapshots(snapshots):
+    # restore in the reverse order of the backups, like nested guards
+    for snapshot in reversed(list(snapshots.values())):
+        snapshot.__exit__()
+
+
+@pytest.fixture(scope='session')
+def _fileguard_session_snapshots():
+    snapshots = {}
+    yield snapshots
+    _exit_snapshots(snapshots)
+
+
+@pytest.fixture(scope='module')
+def _fileguard_module_snapshots():
+    snapshots = {}
+    yield snapshots
+    _exit_snapshots(snapshots)
+
+
+@pytest.fixture
+def fileguard(request):
+    """Fileguard the declared paths for the duration of the test.
+
+    The paths are backed up the first time that a test in their scope needs
+    them and are reset after each test. Returns the list of the absolute
+    guarded paths.
+    """
+    started = time.perf_counter()
+    guarded = []
+    for scope, path in _get_declared_paths(request):
+        snapshots = request.getfixturevalue(f'_fileguard_{scope}_snapshots')
+        # an absolute path, so that the restore is not affected by tests
+        # changing the working directory
+        key = os.path.abspath(path)
+        if key not in snapshots:
+            snapshot = _guard([key], mirror=True)
+            snapshot.__enter__()
+            snapshots[key] = snapshot
+        guarded.append((snapshots[key], key))
+    backup_time = time.perf_counter() - started
+
+    yield [path for _, path in guarded]
+
+    started = time.perf_counter()
+    for snapshot, _ in reversed(guarded):
+        snapshot.reset()
+    reset_time = time.perf_counter() - started
+
+    if guarded:
+        timings = request.config.stash[_timings_key]
+        timings[request.node.nodeid] = (backup_time, reset_time)
+
+
+@pytest.fixture(autouse=True)
+def _fileguard_autoreset(request):
+    if (request.node.get_closest_marker('fileguard') is not None or
+            request.config.getini('fileguard_paths')):
+        request.getfixturevalue('fileguard')
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    timings = config.stash.get(_timings_key, {})
+    if not timings:
+        return
+
+    terminalreporter.write_sep('=', 'fileguard timings')
+    total = 0.0
+    for nodeid, (backup_time, reset_time) in sorted(
+            timings.items(), key=lambda item: sum(item[1]), reverse=True):
+        total += backup_time + reset_time
+        terminalreporter.write_line(
+            f'{backup_time + reset_time:.4f}s {nodeid} '
+            f'(backup {backup_time:.4f}s, reset {reset_time:.4f}s)')
+    terminalreporter.write_line(f'{total:.4f}s total in {len(timings)} tests')
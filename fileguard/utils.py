@@ -1,5 +1,134 @@
+import os
+import stat
+import shutil
 from pathlib import Path
 
 def path_is_dir(path):
     path = Path(path)
     return path.is_dir()
+
+def path_size(path, follow_symlinks=True):
+    """Return the number of bytes that a copy of ``path`` will take up.
+
+    For a directory, the sizes of all of the files within it are summed up.
+    By default, symbolic links within the directory are followed, just like
+    ``distutils.dir_util.copy_tree()`` does. Otherwise, they are not counted.
+    The top-level ``path`` itself is always followed.
+    """
+    if not path_is_dir(path):
+        return os.stat(path).st_size
+
+    size = 0
+    for root, dirs, files in os.walk(path, followlinks=follow_symlinks):
+        for name in files:
+            file_path = os.path.join(root, name)
+            if follow_symlinks:
+                size += os.stat(file_path).st_size
+            elif not os.path.islink(file_path):
+                size += os.lstat(file_path).st_size
+    return size
+
+def free_space(path):
+    """Return the number of bytes available to unprivileged users on the
+    filesystem containing ``path``."""
+    if hasattr(os, 'statvfs'):
+        st = os.statvfs(path)
+        return st.f_bavail * st.f_frsize
+    # os.statvfs() is not available on Windows
+    return shutil.disk_usage(path).free
+
+_USER_RWX = stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR
+
+def _make_dir_accessible(path):
+    """Give the owner read, write and search permissions on a directory."""
+    mode = os.lstat(path).st_mode
+    if mode & _USER_RWX != _USER_RWX:
+        os.chmod(path, mode | _USER_RWX)
+
+def _make_tree_accessible(path):
+    _make_dir_accessible(path)
+    for root, dirs, files in os.walk(path):
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            # os.walk() lists symlinks to directories, but does not follow them
+            if not os.path.islink(dir_path):
+                _make_dir_accessible(dir_path)
+
+def _remove_path(path):
+    """Remove a file, a symbolic link or a whole directory tree."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        try:
+            shutil.rmtree(path)
+        except PermissionError:
+            # some of the directories within the tree are not accessible,
+            # fix their permissions, since they are removed anyway
+            _make_tree_accessible(path)
+            shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+def _scandir_by_name(path):
+    with os.scandir(path) as it:
+        return {entry.name: entry for entry in it}
+
+def mirror_path(src, dst):
+    """Make ``dst`` an exact mirror of ``src``.
+
+    Unlike a merging copy, entries of ``dst`` which do not exist in ``src`` are
+    removed, entry types and permissions are reset and symbolic links are
+    recreated. Both trees are compared in a single pass and regular files
+    whose size and modification time already match are not copied again.
+    """
+    if not os.path.isdir(src) or os.path.islink(src):
+        if os.path.lexists(dst):
+            _remove_path(dst)
+        shutil.copy2(src, dst, follow_symlinks=False)
+        return
+
+    if os.path.islink(dst) or (os.path.lexists(dst) and not os.path.isdir(dst)):
+        os.unlink(dst)
+
+    if not os.path.lexists(dst):
+        shutil.copytree(src, dst, symlinks=True)
+        return
+
+    # make sure that the entries of the directory can be listed and changed,
+    # its original permissions are restored at the end
+    _make_dir_accessible(dst)
+
+    src_entries = _scandir_by_name(src)
+    dst_entries = _scandir_by_name(dst)
+
+    for name, dst_entry in dst_entries.items():
+        if name not in src_entries:
+            _remove_path(dst_entry.path)
+
+    for name, src_entry in src_entries.items():
+        dst_entry = dst_entries.get(name)
+        dst_path = os.path.join(dst, name)
+
+        if src_entry.is_symlink():
+            target = os.readlink(src_entry.path)
+            if dst_entry is not None:
+                if dst_entry.is_symlink() and os.readlink(dst_path) == target:
+                    continue
+                _remove_path(dst_path)
+            os.symlink(target, dst_path)
+        elif src_entry.is_dir():
+            mirror_path(src_entry.path, dst_path)
+        else:
+            if dst_entry is not None:
+                if dst_entry.is_file(follow_symlinks=False):
+                    src_stat = src_entry.stat(follow_symlinks=False)
+                    dst_stat = dst_entry.stat(follow_symlinks=False)
+                    if (src_stat.st_size == dst_stat.st_size and
+                            src_stat.st_mtime_ns == dst_stat.st_mtime_ns):
+                        if src_stat.st_mode != dst_stat.st_mode:
+                            os.chmod(dst_path, stat.S_IMODE(src_stat.st_mode))
+                        continue
+                # unlink rather than overwrite, in case the file is read-only
+                # or hard linked elsewhere
+                _remove_path(dst_path)
+            shutil.copy2(src_entry.path, dst_path, follow_symlinks=False)
+
+    shutil.copystat(src, dst, follow_symlinks=False)
@@ -14,6 +14,11 @@ setuptools.setup(
     long_description_content_type='text/markdown',
     url='https://github.com/iluxonchik/fileguard',
     license = 'MIT',
+    entry_points={
+        # named after the module, so that '-p fileguard.pytest_plugin'
+        # does not register the plugin a second time
+        'pytest11': ['fileguard.pytest_plugin = fileguard.pytest_plugin'],
+    },
     classifiers=(
         'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
@@ -22,6 +27,7 @@ setuptools.setup(
         'Operating System :: OS Independent',
         'Topic :: Software Development :: Testing',
         'Topic :: Software Development :: Testing :: Unit',
+        'Framework :: Pytest',
 
     ),
     keywords = ['testing',
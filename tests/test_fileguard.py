@@ -3,8 +3,9 @@ import os
 import shutil
 import filecmp
 from pathlib import Path
-from unittest.mock import Mock
-from fileguard.fileguard import guard
+import tempfile
+from unittest.mock import Mock, patch
+from fileguard.fileguard import guard, set_backup_roots, BACKUP_ROOTS_ENV_VAR
 
 class TestFileGuardDecorator(unittest.TestCase):
 
@@ -564,3 +565,235 @@ class TestFileGuardDecoratorDirectory(unittest.TestCase):
         self.assertTrue(dir.is_dir(), 'Directory not found')
         self._assert_file_content_equals(self.TEST_TEXT_FILE_1_PATH, self.TEST_FILE_1_CONTENTS)
         self._assert_file_content_equals(self.TEST_TEXT_FILE_2_PATH, self.TEST_FILE_2_CONTENTS)
+
+
+class TestFileGuardBackupRoots(unittest.TestCase):
+
+    TEST_TEXT_FILE_PATH = './tests/resources/test_text_file.txt'
+    TEST_FILE_CONTENTS = ['would\n', 'you do it\n', 'if my name was\n', 'dre\n']
+
+    def setUp(self):
+        with open(self.TEST_TEXT_FILE_PATH, 'w') as file:
+            file.writelines(self.TEST_FILE_CONTENTS)
+
+        self._root_1 = tempfile.TemporaryDirectory()
+        self._root_2 = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        set_backup_roots()
+        self._root_1.cleanup()
+        self._root_2.cleanup()
+
+        try:
+            os.remove(self.TEST_TEXT_FILE_PATH)
+        except FileNotFoundError:
+            pass
+
+    def _assert_backup_root(self, fileguard, root):
+        backup_dir = os.path.dirname(fileguard._tmp_dir.name)
+        self.assertEqual(os.path.realpath(root), os.path.realpath(backup_dir))
+
+    def test_per_guard_backup_root_used(self):
+        with guard(self.TEST_TEXT_FILE_PATH, backup_roots=[self._root_1.name]) as g:
+            self._assert_backup_root(g, self._root_1.name)
+            os.remove(self.TEST_TEXT_FILE_PATH)
+
+        with open(self.TEST_TEXT_FILE_PATH, 'r') as file:
+            self.assertEqual(self.TEST_FILE_CONTENTS, file.readlines())
+
+    def test_missing_backup_root_skipped(self):
+        missing_root = os.path.join(self._root_1.name, 'missing')
+        roots = [missing_root, self._root_2.name]
+        with guard(self.TEST_TEXT_FILE_PATH, backup_roots=roots) as g:
+            self._assert_backup_root(g, self._root_2.name)
+
+    def test_backup_root_without_capacity_skipped(self):
+        def fake_free_space(path):
+            return 0 if path == self._root_1.name else 1024 ** 3
+
+        roots = [self._root_1.name, self._root_2.name]
+        with patch('fileguard.fileguard.free_space', side_effect=fake_free_space):
+            with guard(self.TEST_TEXT_FILE_PATH, backup_roots=roots) as g:
+                self._assert_backup_root(g, self._root_2.name)
+
+    def test_symlinks_counted_in_backup_size(self):
+        # the directory only holds symlinks to 10000 bytes of data, which
+        # are followed when it is backed up
+        data_path = os.path.join(self._root_2.name, 'data')
+        os.makedirs(os.path.join(data_path, 'linked_dir'))
+        with open(os.path.join(data_path, 'big_file'), 'wb') as file:
+            file.write(b'0' * 5000)
+        with open(os.path.join(data_path, 'linked_dir', 'big_file'), 'wb') as file:
+            file.write(b'0' * 5000)
+
+        directory_path = os.path.join(self._root_2.name, 'dir_with_links')
+        os.makedirs(directory_path)
+        os.symlink(os.path.join(data_path, 'big_file'), os.path.join(directory_path, 'file_link'))
+        os.symlink(os.path.join(data_path, 'linked_dir'), os.path.join(directory_path, 'dir_link'))
+
+        def fake_free_space(path):
+            return 9999 if path == self._root_1.name else 1024 ** 3
+
+        roots = [self._root_1.name, self._root_2.name]
+        with patch('fileguard.fileguard.free_space', side_effect=fake_free_space):
+            with guard(directory_path, backup_roots=roots) as g:
+                self._assert_backup_root(g, self._root_2.name)
+
+    def test_falls_back_to_default_temp_dir(self):
+        with patch('fileguard.fileguard.free_space', return_value=0):
+            with guard(self.TEST_TEXT_FILE_PATH, backup_roots=[self._root_1.name]) as g:
+                self._assert_backup_root(g, tempfile.gettempdir())
+
+    def test_module_level_backup_roots(self):
+        set_backup_roots(self._root_1.name)
+        with guard(self.TEST_TEXT_FILE_PATH) as g:
+            self._assert_backup_root(g, self._root_1.name)
+
+        with guard(self.TEST_TEXT_FILE_PATH, backup_roots=[self._root_2.name]) as g:
+            self._assert_backup_root(g, self._root_2.name)
+
+    def test_env_var_backup_roots(self):
+        with patch.dict(os.environ, {BACKUP_ROOTS_ENV_VAR: self._root_2.name}):
+            with guard(self.TEST_TEXT_FILE_PATH) as g:
+                self._assert_backup_root(g, self._root_2.name)
+
+            set_backup_roots(self._root_1.name)
+            with guard(self.TEST_TEXT_FILE_PATH) as g:
+                self._assert_backup_root(g, self._root_1.name)
+
+
+class TestFileGuardMirrorDirectory(unittest.TestCase):
+
+    DIRECTORY_PATH = './tests/resources/dir_to_mirror/'
+    TEST_TEXT_FILE_1_PATH = os.path.join('./tests/resources/dir_to_mirror/', 'test_text_file_1.txt')
+    TEST_FILE_1_CONTENTS = ['would\n', 'you do it\n', 'if my name was\n', 'dre\n']
+
+    SUB_DIRECTORY_PATH = os.path.join('./tests/resources/dir_to_mirror/', 'sub_dir')
+    TEST_TEXT_FILE_2_PATH = os.path.join('./tests/resources/dir_to_mirror/', 'sub_dir', 'test_text_file_2.txt')
+    TEST_FILE_2_CONTENTS = ['throw\n', 'it up\n', 'for the king\n', 'of L.A.\n']
+
+    SYMLINK_PATH = os.path.join('./tests/resources/dir_to_mirror/', 'link')
+    EXTRA_FILE_PATH = os.path.join('./tests/resources/dir_to_mirror/', 'extra.txt')
+
+    def setUp(self):
+        os.makedirs(self.SUB_DIRECTORY_PATH)
+
+        with open(self.TEST_TEXT_FILE_1_PATH, 'w') as file:
+            file.writelines(self.TEST_FILE_1_CONTENTS)
+
+        with open(self.TEST_TEXT_FILE_2_PATH, 'w') as file:
+            file.writelines(self.TEST_FILE_2_CONTENTS)
+
+        os.symlink('test_text_file_1.txt', self.SYMLINK_PATH)
+
+    def tearDown(self):
+        shutil.rmtree(self.DIRECTORY_PATH, ignore_errors=True)
+
+    def _assert_file_content_equals(self, path, lines):
+        with open(path, 'r') as file:
+            file_contents = file.readlines()
+
+        self.assertEqual(lines, file_contents)
+
+    def _assert_directory_restored(self):
+        self._assert_file_content_equals(self.TEST_TEXT_FILE_1_PATH, self.TEST_FILE_1_CONTENTS)
+        self._assert_file_content_equals(self.TEST_TEXT_FILE_2_PATH, self.TEST_FILE_2_CONTENTS)
+        self.assertTrue(os.path.islink(self.SYMLINK_PATH), 'Symlink not restored')
+        self.assertEqual('test_text_file_1.txt', os.readlink(self.SYMLINK_PATH))
+        self.assertEqual(['link', 'sub_dir', 'test_text_file_1.txt'],
+                         sorted(os.listdir(self.DIRECTORY_PATH)))
+        self.assertEqual(['test_text_file_2.txt'], os.listdir(self.SUB_DIRECTORY_PATH))
+
+    def test_created_files_removed(self):
+        with guard(self.DIRECTORY_PATH, mirror=True):
+            with open(self.EXTRA_FILE_PATH, 'w') as file:
+                file.write('extra')
+            os.makedirs(os.path.join(self.SUB_DIRECTORY_PATH, 'extra_dir', 'nested'))
+
+        self._assert_directory_restored()
+
+    def test_created_files_kept_without_mirror(self):
+        with guard(self.DIRECTORY_PATH):
+            with open(self.EXTRA_FILE_PATH, 'w') as file:
+                file.write('extra')
+
+        self.assertTrue(os.path.isfile(self.EXTRA_FILE_PATH), 'File was removed')
+
+    def test_changed_files_restored(self):
+        with guard(self.DIRECTORY_PATH, mirror=True):
+            with open(self.TEST_TEXT_FILE_1_PATH, 'w') as file:
+                file.write('of course\nI would\n')
+            os.remove(self.TEST_TEXT_FILE_2_PATH)
+
+        self._assert_directory_restored()
+
+    def test_types_and_symlinks_restored(self):
+        with guard(self.DIRECTORY_PATH, mirror=True):
+            os.remove(self.SYMLINK_PATH)
+            os.symlink('sub_dir', self.SYMLINK_PATH)
+            shutil.rmtree(self.SUB_DIRECTORY_PATH)
+            with open(self.SUB_DIRECTORY_PATH, 'w') as file:
+                file.write('no longer a directory')
+            os.remove(self.TEST_TEXT_FILE_1_PATH)
+            os.makedirs(self.TEST_TEXT_FILE_1_PATH)
+
+        self._assert_directory_restored()
+
+    def test_permissions_restored(self):
+        file_mode = os.stat(self.TEST_TEXT_FILE_1_PATH).st_mode
+        dir_mode = os.stat(self.SUB_DIRECTORY_PATH).st_mode
+
+        with guard(self.DIRECTORY_PATH, mirror=True):
+            os.chmod(self.TEST_TEXT_FILE_1_PATH, 0o400)
+            os.chmod(self.SUB_DIRECTORY_PATH, 0o500)
+
+        self.assertEqual(file_mode, os.stat(self.TEST_TEXT_FILE_1_PATH).st_mode)
+        self.assertEqual(dir_mode, os.stat(self.SUB_DIRECTORY_PATH).st_mode)
+        self._assert_directory_restored()
+
+        with guard(self.DIRECTORY_PATH, mirror=True):
+            os.chmod(self.SUB_DIRECTORY_PATH, 0o000)
+
+        self.assertEqual(dir_mode, os.stat(self.SUB_DIRECTORY_PATH).st_mode)
+        self._assert_directory_restored()
+
+    def test_read_only_created_directory_removed(self):
+        extra_dir_path = os.path.join(self.SUB_DIRECTORY_PATH, 'extra_dir')
+
+        with guard(self.DIRECTORY_PATH, mirror=True):
+            os.makedirs(os.path.join(extra_dir_path, 'nested'))
+            with open(os.path.join(extra_dir_path, 'nested', 'extra.txt'), 'w') as file:
+                file.write('extra')
+            os.chmod(os.path.join(extra_dir_path, 'nested'), 0o500)
+            os.chmod(extra_dir_path, 0o000)
+
+        self._assert_directory_restored()
+
+    def test_directory_restored_on_delete(self):
+        with guard(self.DIRECTORY_PATH, mirror=True):
+            shutil.rmtree(self.DIRECTORY_PATH)
+
+        self._assert_directory_restored()
+
+    def test_guarded_directory_symlink_restored(self):
+        link_path = './tests/resources/dir_to_mirror_link'
+        os.symlink('dir_to_mirror', link_path)
+        try:
+            with guard(link_path, mirror=True):
+                with open(os.path.join(link_path, 'test_text_file_1.txt'), 'w') as file:
+                    file.write('of course\nI would\n')
+                with open(os.path.join(link_path, 'extra.txt'), 'w') as file:
+                    file.write('extra')
+
+            self.assertTrue(os.path.islink(link_path), 'Symlink replaced')
+            self._assert_directory_restored()
+        finally:
+            os.remove(link_path)
+
+    def test_guarded_file_symlink_restored(self):
+        link_path = os.path.join(self.DIRECTORY_PATH, 'link')
+        with guard(link_path, mirror=True):
+            with open(link_path, 'w') as file:
+                file.write('CHANGED')
+
+        self._assert_directory_restored()
@@ -0,0 +1,172 @@
+import unittest
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from fileguard import fingerprint
+from fileguard import fingerprints
+from fileguard.fingerprints import StatCache, _hash_file
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.directory_path = os.path.join(self._tmp_dir.name, 'dir_to_fingerprint')
+        self.sub_directory_path = os.path.join(self.directory_path, 'sub_dir')
+        self.file_1_path = os.path.join(self.directory_path, 'test_text_file_1.txt')
+        self.file_2_path = os.path.join(self.sub_directory_path, 'test_text_file_2.txt')
+
+        os.makedirs(self.sub_directory_path)
+
+        with open(self.file_1_path, 'w') as file:
+            file.write('would\nyou do it\nif my name was\ndre\n')
+
+        with open(self.file_2_path, 'w') as file:
+            file.write('throw\nit up\nfor the king\nof L.A.\n')
+
+        self.cache = StatCache()
+        fingerprints._root_caches.clear()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+        fingerprints._root_caches.clear()
+
+    def _fingerprint(self, path=None):
+        return fingerprint(path or self.directory_path, cache=self.cache)
+
+    def test_unchanged_tree_same_fingerprint(self):
+        self.assertEqual(self._fingerprint(), self._fingerprint())
+
+    def test_copied_tree_same_fingerprint(self):
+        copy_path = os.path.join(self._tmp_dir.name, 'copy')
+        shutil.copytree(self.directory_path, copy_path)
+
+        self.assertEqual(self._fingerprint(), self._fingerprint(copy_path))
+
+    def test_file_fingerprint(self):
+        before = self._fingerprint(self.file_1_path)
+
+        with open(self.file_1_path, 'a') as file:
+            file.write('day\n')
+
+        self.assertNotEqual(before, self._fingerprint(self.file_1_path))
+
+    def test_changed_content_changes_fingerprint(self):
+        before = self._fingerprint()
+
+        with open(self.file_2_path, 'w') as file:
+            file.write('still\ndre\nday\n')
+
+        self.assertNotEqual(before, self._fingerprint())
+
+    def test_created_and_removed_files_change_fingerprint(self):
+        before = self._fingerprint()
+
+        extra_path = os.path.join(self.sub_directory_path, 'extra.txt')
+        with open(extra_path, 'w') as file:
+            file.write('extra')
+        self.assertNotEqual(before, self._fingerprint())
+
+        os.remove(extra_path)
+        self.assertEqual(before, self._fingerprint())
+
+        os.remove(self.file_1_path)
+        self.assertNotEqual(before, self._fingerprint())
+
+    def test_permissions_change_fingerprint(self):
+        before = self._fingerprint()
+        os.chmod(self.file_1_path, 0o400)
+
+        self.assertNotEqual(before, self._fingerprint())
+
+    def test_symlink_target_changes_fingerprint(self):
+        link_path = os.path.join(self.directory_path, 'link')
+        os.symlink('test_text_file_1.txt', link_path)
+        before = self._fingerprint()
+
+        os.remove(link_path)
+        os.symlink('sub_dir', link_path)
+
+        self.assertNotEqual(before, self._fingerprint())
+
+    def test_root_symlink_followed(self):
+        link_path = os.path.join(self._tmp_dir.name, 'link')
+        os.symlink(self.directory_path, link_path)
+        before = self._fingerprint(link_path)
+        self.assertEqual(self._fingerprint(), before)
+
+        with open(os.path.join(self.directory_path, 'extra.txt'), 'w') as file:
+            file.write('extra')
+
+        self.assertNotEqual(before, self._fingerprint(link_path))
+
+    def test_cache_keyed_by_path_without_inode(self):
+        stat_result = os.stat(self.file_1_path)
+        no_inode = os.stat_result((stat_result.st_mode, 0, 0) + tuple(stat_result)[3:])
+
+        self.cache.put(self.file_1_path, no_inode, b'digest')
+
+        self.assertEqual(b'digest', self.cache.get(self.file_1_path, no_inode))
+        self.assertIsNone(self.cache.get(self.file_2_path, no_inode))
+
+    def test_unchanged_files_not_rehashed(self):
+        with patch('fileguard.fingerprints._hash_file', side_effect=_hash_file) as hash_file:
+            self._fingerprint()
+            self.assertEqual(2, hash_file.call_count)
+
+            self._fingerprint()
+            self.assertEqual(2, hash_file.call_count)
+
+            with open(self.file_1_path, 'a') as file:
+                file.write('day\n')
+            self._fingerprint()
+            self.assertEqual(3, hash_file.call_count)
+
+        self.assertEqual(3, len(self.cache))
+
+    def test_large_files_hashed_in_thread_pool(self):
+        small_file_fingerprint = self._fingerprint()
+
+        with patch('fileguard.fingerprints.LARGE_FILE_SIZE', 1):
+            with patch('fileguard.fingerprints.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as executor:
+                large_file_fingerprint = fingerprint(self.directory_path,
+                                                     cache=StatCache(),
+                                                     max_workers=2)
+
+        executor.assert_called_once_with(max_workers=2)
+        self.assertEqual(small_file_fingerprint, large_file_fingerprint)
+
+    def test_default_cache_not_rehashing_unchanged_files(self):
+        with patch('fileguard.fingerprints._hash_file', side_effect=_hash_file) as hash_file:
+            before = fingerprint(self.directory_path)
+            self.assertEqual(2, hash_file.call_count)
+
+            self.assertEqual(before, fingerprint(self.directory_path))
+            self.assertEqual(2, hash_file.call_count)
+
+            with open(self.file_1_path, 'a') as file:
+                file.write('day\n')
+            self.assertNotEqual(before, fingerprint(self.directory_path))
+            self.assertEqual(3, hash_file.call_count)
+
+    def test_default_cache_drops_missing_files(self):
+        fingerprint(self.directory_path)
+        root_cache = fingerprints._root_caches[os.path.realpath(self.directory_path)]
+        self.assertEqual(2, len(root_cache))
+
+        with open(self.file_1_path, 'a') as file:
+            file.write('day\n')
+        os.remove(self.file_2_path)
+        fingerprint(self.directory_path)
+
+        self.assertEqual(1, len(root_cache))
+
+    def test_default_cache_bounded_by_roots(self):
+        with patch('fileguard.fingerprints.MAX_CACHED_ROOTS', 1):
+            fingerprint(self.directory_path)
+            fingerprint(self.sub_directory_path)
+
+        self.assertEqual([os.path.realpath(self.sub_directory_path)],
+                         list(fingerprints._root_caches))
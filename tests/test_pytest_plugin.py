@@ -0,0 +1,186 @@
+import pytest
+
+pytest_plugins = ['pytester']
+
+
+class TestFileGuardPytestPlugin(object):
+    """
+    Run pytest sessions which use the fileguard plugin and check that the
+    declared paths are shared and reset between tests.
+    """
+
+    TEST_MODULE = """
+import os
+import pytest
+
+def test_change(fileguard):
+    with open('data/file.txt', 'w') as file:
+        file.write('changed')
+    with open('data/extra.txt', 'w') as file:
+        file.write('extra')
+
+def test_unchanged(fileguard):
+    assert os.listdir('data') == ['file.txt']
+    with open('data/file.txt', 'r') as file:
+        assert file.read() == 'original'
+"""
+
+    @pytest.fixture(autouse=True)
+    def _set_up_files(self, pytester):
+        pytester.mkdir('data')
+        pytester.path.joinpath('data', 'file.txt').write_text('original')
+
+    def test_ini_paths_reset_after_each_test(self, pytester):
+        pytester.makeini('[pytest]\nfileguard_paths =\n    data\n')
+        pytester.makepyfile(self.TEST_MODULE)
+
+        result = pytester.runpytest('-p', 'fileguard.pytest_plugin')
+
+        result.assert_outcomes(passed=2)
+        result.stdout.fnmatch_lines(['*fileguard timings*', '*2 tests'])
+        assert pytester.path.joinpath('data', 'file.txt').read_text() == 'original'
+        assert not pytester.path.joinpath('data', 'extra.txt').exists()
+
+    def test_marker_paths_reset_after_each_test(self, pytester):
+        pytester.makepyfile("""
+import os
+import pytest
+
+@pytest.mark.fileguard('data', scope='module')
+def test_change():
+    with open('data/file.txt', 'w') as file:
+        file.write('changed')
+
+@pytest.mark.fileguard('data', scope='module')
+def test_unchanged():
+    with open('data/file.txt', 'r') as file:
+        assert file.read() == 'original'
+""")
+
+        result = pytester.runpytest('-p', 'fileguard.pytest_plugin')
+
+        result.assert_outcomes(passed=2)
+        assert pytester.path.joinpath('data', 'file.txt').read_text() == 'original'
+
+    def test_paths_relative_to_ini_file_and_rootdir(self, pytester, monkeypatch):
+        pytester.makeini('[pytest]\nfileguard_paths =\n    data\n')
+        tests_path = pytester.mkdir('tests')
+        tests_path.joinpath('test_module.py').write_text("""
+import os
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+def test_change():
+    with open(os.path.join(ROOT, 'data', 'file.txt'), 'w') as file:
+        file.write('changed')
+
+@pytest.mark.fileguard('data/file.txt')
+def test_change_marker():
+    with open(os.path.join(ROOT, 'data', 'file.txt'), 'w') as file:
+        file.write('changed')
+""")
+        monkeypatch.chdir(tests_path)
+
+        result = pytester.runpytest('-p', 'fileguard.pytest_plugin')
+
+        result.assert_outcomes(passed=2)
+        assert pytester.path.joinpath('data', 'file.txt').read_text() == 'original'
+
+    def test_restore_not_affected_by_chdir(self, pytester):
+        other_data_path = pytester.mkdir('other').joinpath('data')
+        other_data_path.mkdir()
+        other_data_path.joinpath('extra.txt').write_text('extra')
+
+        pytester.makeini('[pytest]\nfileguard_paths =\n    data\n')
+        pytester.makepyfile("""
+import os
+
+def test_chdir():
+    with open('data/extra.txt', 'w') as file:
+        file.write('extra')
+    os.chdir('other')
+""")
+
+        result = pytester.runpytest('-p', 'fileguard.pytest_plugin')
+
+        result.assert_outcomes(passed=1)
+        assert not pytester.path.joinpath('data', 'extra.txt').exists()
+        assert other_data_path.joinpath('extra.txt').exists()
+
+    def test_symlinked_path_restored(self, pytester):
+        pytester.path.joinpath('data_link').symlink_to('data')
+        pytester.makeini('[pytest]\nfileguard_paths =\n    data_link\n')
+        pytester.makepyfile("""
+def test_change():
+    with open('data_link/file.txt', 'w') as file:
+        file.write('changed')
+    with open('data_link/extra.txt', 'w') as file:
+        file.write('extra')
+""")
+
+        result = pytester.runpytest('-p', 'fileguard.pytest_plugin')
+
+        result.assert_outcomes(passed=1)
+        assert pytester.path.joinpath('data_link').is_symlink()
+        assert pytester.path.joinpath('data', 'file.txt').read_text() == 'original'
+        assert not pytester.path.joinpath('data', 'extra.txt').exists()
+
+    def test_paths_backed_up_once_per_session(self, pytester, monkeypatch):
+        pytester.makeini('[pytest]\nfileguard_paths =\n    data\n')
+        pytester.makepyfile(test_one=self.TEST_MODULE, test_two=self.TEST_MODULE)
+        pytester.makeconftest("""
+import fileguard.fileguard
+
+backups = []
+original = fileguard.fileguard._guard._store_backup_content
+
+def counting_store_backup_content(self):
+    backups.append(self)
+    original(self)
+
+fileguard.fileguard._guard._store_backup_content = counting_store_backup_content
+
+def pytest_sessionfinish(session):
+    assert len(backups) == 1
+""")
+
+        result = pytester.runpytest('-p', 'fileguard.pytest_plugin')
+
+        result.assert_outcomes(passed=4)
+        assert result.ret == 0
+
+    @pytest.mark.parametrize('args', [(), ('-p', 'fileguard.pytest_plugin')])
+    def test_installed_entry_point(self, pytester, monkeypatch, args):
+        # register the plugin the way an installed fileguard does, see the
+        # entry points in setup.py
+        site_path = pytester.mkdir('site')
+        dist_info_path = site_path.joinpath('fileguard-0.0.1.dist-info')
+        dist_info_path.mkdir()
+        dist_info_path.joinpath('METADATA').write_text(
+            'Metadata-Version: 2.1\nName: fileguard\nVersion: 0.0.1\n')
+        dist_info_path.joinpath('entry_points.txt').write_text(
+            '[pytest11]\nfileguard.pytest_plugin = fileguard.pytest_plugin\n')
+        monkeypatch.syspath_prepend(site_path)
+        monkeypatch.delenv('PYTEST_DISABLE_PLUGIN_AUTOLOAD', raising=False)
+
+        pytester.makeini('[pytest]\nfileguard_paths =\n    data\n')
+        pytester.makepyfile(self.TEST_MODULE)
+
+        result = pytester.runpytest(*args)
+
+        result.assert_outcomes(passed=2)
+        result.stdout.fnmatch_lines(['*fileguard timings*'])
+
+    def test_invalid_scope(self, pytester):
+        pytester.makepyfile("""
+import pytest
+
+@pytest.mark.fileguard('data', scope='class')
+def test_something():
+    pass
+""")
+
+        result = pytester.runpytest('-p', 'fileguard.pytest_plugin')
+
+        result.stdout.fnmatch_lines(["*Invalid fileguard scope 'class'*"])